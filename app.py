@@ -1,40 +1,90 @@
 # app.py - Main Flask application for Automated Deadlock Detection Tool
 # Features: Web GUI, deadlock detection, input validation, resolution suggestions, DB for history.
-# DB: SQLite table 'history' stores past runs (n, m, matrices as JSON, result, suggestions, timestamp).
+# DB: SQLite table 'history' stores past runs (n, m, matrices as int32 BLOBs, result, suggestions, timestamp).
 # Run: python app.py (access at http://127.0.0.1:5000/)
 
 from flask import Flask, request, render_template, redirect, url_for
 import sqlite3
 import json
-from datetime import datetime
+import numpy as np
+import threading
+import queue
+from functools import lru_cache
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None  # Numba is optional; fall back to the NumPy kernel below
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads  # orjson is optional; its errors subclass json.JSONDecodeError
 
 app = Flask(__name__)
 
-# Database setup
+# Database setup: one writer connection plus a small pool of read-only connections.
+# WAL lets readers run alongside the writer, so /history does not wait behind POSTs.
+DB_PATH = 'deadlock_history.db'
+READER_POOL_SIZE = 4
+HISTORY_LIMIT = 100  # Most recent runs shown on the history page
+
+_writer = sqlite3.connect(f'file:{DB_PATH}?mode=rwc', uri=True, check_same_thread=False, isolation_level=None)
+_writer.executescript("PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; PRAGMA temp_store=MEMORY; PRAGMA cache_size=-65536;")
+_writer_lock = threading.Lock()  # Flask may serve requests from several threads
+_readers = queue.Queue()
+
+def _open_reader():
+    connection = sqlite3.connect(f'file:{DB_PATH}?mode=ro', uri=True, check_same_thread=False, isolation_level=None)
+    connection.execute('PRAGMA cache_size=-16384')
+    return connection
+
+_initialized = False
+
 def init_db():
-    connection = sqlite3.connect('deadlock_history.db')
-    c = connection.cursor()
-    c.execute('''CREATE TABLE IF NOT EXISTS history (
-                    id INTEGER PRIMARY KEY,
-                    n INTEGER,
-                    m INTEGER,
-                    allocation TEXT,
-                    request TEXT,
-                    available TEXT,
-                    result TEXT,
-                    suggestions TEXT,
-                    safe_sequence TEXT,
-                    timestamp TEXT
-                )''')
-    # Add safe_sequence column if it doesn't exist
-    try:
-        c.execute('ALTER TABLE history ADD COLUMN safe_sequence TEXT')
-    except sqlite3.OperationalError:
-        pass  # Column already exists
-    connection.commit()
-    connection.close()
+    global _initialized
+    with _writer_lock:
+        if _initialized:
+            return  # Schema already set up by this process
+        c = _writer.cursor()
+        c.execute('''CREATE TABLE IF NOT EXISTS history (
+                        id INTEGER PRIMARY KEY,
+                        n INTEGER,
+                        m INTEGER,
+                        allocation BLOB,
+                        request BLOB,
+                        available BLOB,
+                        result TEXT,
+                        suggestions TEXT,
+                        safe_sequence BLOB,
+                        timestamp TEXT DEFAULT (datetime('now', 'localtime'))
+                    )''')
+        # Add safe_sequence column if it doesn't exist (tables from before it was introduced)
+        cols = {row[1] for row in c.execute('PRAGMA table_info(history)')}
+        if 'safe_sequence' not in cols:
+            c.execute('ALTER TABLE history ADD COLUMN safe_sequence BLOB')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_history_ts ON history(timestamp DESC)')
+        _initialized = True
 
 init_db()
+for _ in range(READER_POOL_SIZE):
+    _readers.put(_open_reader())
+
+def _as_shape(values, shape):
+    """
+    Returns values as an ndarray of the given shape, or None if the shape differs.
+    Arrays are passed through without copying; an empty list with zero rows
+    matches a (0, m) shape, as the old length checks allowed.
+    """
+    try:
+        arr = np.asarray(values)
+    except ValueError:
+        return None  # Ragged rows
+    if arr.shape == shape:
+        return arr
+    if arr.size == 0 and 0 in shape and arr.shape[:1] == shape[:1]:
+        return arr.reshape(shape)
+    return None
 
 def validate_inputs(n, m, allocation, request, available):
     """
@@ -50,21 +100,156 @@ def validate_inputs(n, m, allocation, request, available):
     Returns:
         tuple: (is_valid (bool), error_message (str))
     """
-    if len(allocation) != n or any(len(row) != m for row in allocation):
+    alloc_arr = _as_shape(allocation, (n, m))
+    if alloc_arr is None:
         return False, "Allocation matrix must be n x m."
-    if len(request) != n or any(len(row) != m for row in request):
+    req_arr = _as_shape(request, (n, m))
+    if req_arr is None:
         return False, "Request matrix must be n x m."
-    if len(available) != m:
+    avail_arr = _as_shape(available, (m,))
+    if avail_arr is None:
         return False, "Available vector must have m elements."
-    for i in range(n):
-        for j in range(m):
-            if allocation[i][j] < 0 or request[i][j] < 0:
-                return False, "Values must be non-negative."
-    for val in available:
-        if val < 0:
-            return False, "Available values must be non-negative."
+    if alloc_arr.min(initial=0) < 0 or req_arr.min(initial=0) < 0:
+        return False, "Values must be non-negative."
+    if avail_arr.min(initial=0) < 0:
+        return False, "Available values must be non-negative."
     return True, ""
 
+# SWAR eligibility test for m <= 8: with one byte per resource, (work | 0x80) - req keeps
+# each lane's high bit set iff req <= work, and no borrow crosses lanes while req <= 127.
+_SWAR_LANES = 8
+_SWAR_HIGH = np.uint64(0x8080808080808080)
+_SWAR_MIN_N = 1000  # Measured: below this the packing setup cancels out the cheaper compare
+
+if njit is not None:
+    @njit(cache=True)
+    def _detect_kernel(alloc, req, avail):
+        """
+        Banker's safety loop compiled with Numba.
+
+        Args:
+            alloc (int32[:, :]): Allocation matrix.
+            req (int32[:, :]): Request matrix.
+            avail (int32[:]): Available resources vector.
+
+        Returns:
+            tuple: (finish (bool[:]), safe_sequence (int64[:]))
+        """
+        n, m = alloc.shape
+        work = avail.astype(np.int64)  # Running totals can exceed int32 even when inputs fit
+        finish = np.zeros(n, np.bool_)
+        safe_seq = np.empty(n, np.int64)
+        seq_len = 0
+        # Same pass semantics as the NumPy kernel: a pass collects every process whose
+        # request fits the work at the start of the pass, then releases them together
+        while seq_len < n:
+            start = seq_len
+            for i in range(n):
+                if finish[i]:
+                    continue
+                eligible = True
+                for j in range(m):
+                    if req[i, j] > work[j]:
+                        eligible = False
+                        break
+                if eligible:
+                    finish[i] = True
+                    safe_seq[seq_len] = i
+                    seq_len += 1
+            if seq_len == start:
+                break
+            for k in range(start, seq_len):
+                for j in range(m):
+                    work[j] += alloc[safe_seq[k], j]
+        return finish, safe_seq[:seq_len]
+else:
+    def _detect_kernel(alloc, req, avail):
+        """
+        Banker's safety loop using NumPy boolean masking.
+
+        Args:
+            alloc (ndarray): Allocation matrix (n x m, int32).
+            req (ndarray): Request matrix (n x m, int32).
+            avail (ndarray): Available resources vector (m, int32).
+
+        Returns:
+            tuple: (finish (ndarray of bool), safe_sequence (ndarray of int))
+        """
+        n, m = alloc.shape
+        work = avail.astype(np.int64)  # Running totals can exceed int32 even when inputs fit
+        finish = np.zeros(n, dtype=bool)
+        safe_seq = np.empty(n, dtype=np.int64)
+        seq_len = 0
+        swar = (n >= _SWAR_MIN_N and m <= _SWAR_LANES and alloc.min(initial=0) >= 0 and avail.min(initial=0) >= 0
+                and req.min(initial=0) >= 0 and req.max(initial=0) <= 127)
+        if swar:
+            # One uint64 per process, one byte per resource (unused lanes stay 0)
+            padded = np.zeros((n, _SWAR_LANES), dtype=np.uint8)
+            padded[:, :m] = req
+            req_packed = padded.view('<u8').ravel()
+            lanes = np.zeros(_SWAR_LANES, dtype=np.uint8)
+        # Each pass releases the resources of every process whose request fits in the
+        # work at the start of the pass; all kernels use this order for the safe sequence
+        while seq_len < n:
+            if swar:
+                # Saturating work at 127 is exact here because every request lane is <= 127
+                lanes[:m] = np.minimum(work, 127)
+                fits = ((lanes.view('<u8')[0] | _SWAR_HIGH) - req_packed) & _SWAR_HIGH == _SWAR_HIGH
+            else:
+                fits = np.all(req <= work, axis=1)
+            cmp = fits & ~finish
+            if not cmp.any():
+                break
+            idx = np.flatnonzero(cmp)
+            work += alloc[idx].sum(axis=0)
+            finish[idx] = True
+            safe_seq[seq_len:seq_len + idx.size] = idx
+            seq_len += idx.size
+        return finish, safe_seq[:seq_len]
+
+# Below this many processes a straight-line Python loop beats NumPy's per-call overhead
+_UNROLL_MAX_N = 64
+_UNROLL_MAX_M = 8
+
+@lru_cache(maxsize=None)
+def _unrolled_kernel(m):
+    """
+    Generates a Banker's safety loop specialised for m resources (1 <= m).
+
+    The per-resource compare and add are unrolled into straight-line code on
+    local variables, so the hot loop has no inner range() or generator. Passes
+    follow the same order as the array kernels.
+
+    Returns:
+        function: f(alloc, req, work, n) -> (finish (list), safe_sequence (list)),
+        taking nested lists of ints.
+    """
+    lanes = ", ".join(f"w{j}" for j in range(m))
+    fits = " and ".join(f"r[{j}] <= w{j}" for j in range(m))
+    release = "; ".join(f"w{j} += a[{j}]" for j in range(m))
+    src = f"""def _detect_unrolled(alloc, req, work, n):
+    {lanes}, = work
+    finish = [False] * n
+    safe_sequence = []
+    while len(safe_sequence) < n:
+        start = len(safe_sequence)
+        for i in range(n):
+            if not finish[i]:
+                r = req[i]
+                if {fits}:
+                    finish[i] = True
+                    safe_sequence.append(i)
+        if len(safe_sequence) == start:
+            break
+        for i in safe_sequence[start:]:
+            a = alloc[i]
+            {release}
+    return finish, safe_sequence
+"""
+    namespace = {}
+    exec(src, namespace)
+    return namespace['_detect_unrolled']
+
 def detect_deadlock(n, m, allocation, request, available):
     """
     Detects deadlocks using the Banker's Algorithm and computes the safe sequence.
@@ -79,37 +264,57 @@ def detect_deadlock(n, m, allocation, request, available):
     Returns:
         tuple: (is_deadlock (bool), deadlocked_processes (list), message (str), safe_sequence (list))
     """
-    work = available.copy()
-    finish = [False] * n
-    safe_sequence = []
-    while True:
-        found = False
-        for i in range(n):
-            if not finish[i] and all(request[i][j] <= work[j] for j in range(m)):
-                work = [work[j] + allocation[i][j] for j in range(m)]
-                finish[i] = True
-                safe_sequence.append(i)
-                found = True
-        if not found:
-            break
-    deadlocked = [i for i in range(n) if not finish[i]]
+    alloc = np.asarray(allocation, dtype=np.int32).reshape(n, m)
+    req = np.asarray(request, dtype=np.int32).reshape(n, m)
+    work = np.asarray(available, dtype=np.int32).reshape(m)
+    if njit is None and 0 < m <= _UNROLL_MAX_M and n <= _UNROLL_MAX_N:
+        finish, safe_sequence = _unrolled_kernel(m)(alloc.tolist(), req.tolist(), work.tolist(), n)
+        deadlocked = [i for i in range(n) if not finish[i]]
+    else:
+        finish, safe_sequence = _detect_kernel(alloc, req, work)
+        safe_sequence = safe_sequence.tolist()
+        deadlocked = np.flatnonzero(~finish).tolist()
     if deadlocked:
         return True, deadlocked, f"Deadlock detected in processes: {deadlocked}.", []
     return False, [], "No deadlock detected.", safe_sequence
 
+_STATIC_STRATEGIES = (
+    "Strategy 1: Terminate one or more deadlocked processes to break the circular wait.",
+    "Strategy 2: Preempt resources from a process and rollback.",
+)
+_STATIC_PREFIX = "<br>".join(_STATIC_STRATEGIES)
+
 def suggest_resolution(deadlocked, allocation, request):
     if not deadlocked:
         return "No action required."
-    suggestions = [
-        "Strategy 1: Terminate one or more deadlocked processes to break the circular wait.",
-        "Strategy 2: Preempt resources from a process and rollback.",
-    ]
     try:
-        victim_candidate = min(deadlocked, key=lambda i: sum(allocation[i]))
-        suggestions.append(f"Recommendation: Terminate Process P{victim_candidate} (holds fewest resources).")
+        alloc_sums = np.asarray(allocation).sum(axis=1)
+        victim_candidate = deadlocked[int(np.argmin(alloc_sums[deadlocked]))]
     except ValueError:
-        pass
-    return "<br>".join(suggestions)
+        return _STATIC_PREFIX
+    return _STATIC_PREFIX + f"<br>Recommendation: Terminate Process P{victim_candidate} (holds fewest resources)."
+
+# Kept as one constant string so sqlite3's per-connection statement cache reuses the compiled INSERT.
+# The timestamp is generated by SQLite; it is spelled out rather than left to the column default
+# because tables created before that default existed do not have one.
+_INSERT_SQL = ("INSERT INTO history (n, m, allocation, request, available, result, suggestions, safe_sequence, timestamp) "
+               "VALUES (?, ?, ?, ?, ?, ?, ?, ?, datetime('now', 'localtime'))")
+
+def _to_blob(values):
+    """
+    Packs an integer matrix or vector into a little-endian int32 BLOB.
+    The shape is not stored; it is recovered from the row's n and m columns.
+    """
+    return sqlite3.Binary(np.asarray(values, dtype='<i4').tobytes())
+
+def _from_blob(value):
+    """
+    Unpacks a BLOB written by _to_blob into a flat list of ints.
+    Rows saved before the BLOB format hold JSON text, which is still accepted.
+    """
+    if isinstance(value, str):
+        return json_loads(value)
+    return np.frombuffer(value, dtype='<i4').tolist()
 
 def save_to_db(n, m, allocation, request, available, result, suggestions, safe_sequence=None):
     """
@@ -125,39 +330,69 @@ def save_to_db(n, m, allocation, request, available, result, suggestions, safe_s
         suggestions (str): Resolution suggestions.
         safe_sequence (list): Safe sequence if no deadlock.
     """
-    connection = sqlite3.connect('deadlock_history.db')
-    c = connection.cursor()
-    c.execute('INSERT INTO history (n, m, allocation, request, available, result, suggestions, safe_sequence, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
-              (n, m, json.dumps(allocation), json.dumps(request),
-                json.dumps(available), result, suggestions, json.dumps(safe_sequence) if safe_sequence else None,
-                datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
-    connection.commit()
-    connection.close()
+    _write_rows([_history_params(n, m, allocation, request, available, result, suggestions, safe_sequence)])
 
-def get_history():
+def save_many(records):
+    """
+    Saves several detection results to the database in one transaction.
+
+    Args:
+        records (iterable): Tuples of save_to_db arguments
+            (n, m, allocation, request, available, result, suggestions, safe_sequence).
+    """
+    _write_rows([_history_params(*record) for record in records])
+
+def _history_params(n, m, allocation, request, available, result, suggestions, safe_sequence=None):
+    return (n, m, _to_blob(allocation), _to_blob(request),
+            _to_blob(available), result, suggestions, _to_blob(safe_sequence) if safe_sequence else None)
+
+def _write_rows(rows):
+    with _writer_lock:
+        # BEGIN IMMEDIATE takes the write lock up front instead of failing with SQLITE_BUSY mid-insert
+        _writer.execute('BEGIN IMMEDIATE')
+        try:
+            _writer.executemany(_INSERT_SQL, rows)
+            _writer.execute('COMMIT')
+        except BaseException:
+            # Never leave the shared autocommit writer inside an open transaction
+            if _writer.in_transaction:
+                _writer.execute('ROLLBACK')
+            raise
+
+def get_history(limit=HISTORY_LIMIT):
     """
     Retrieves the deadlock detection history from the database.
 
+    Args:
+        limit (int): Maximum number of most recent records to return.
+
     Returns:
-        list: List of history records with safe_sequence parsed from JSON.
-    """
-    connection = sqlite3.connect('deadlock_history.db')
-    c = connection.cursor()
-    c.execute('SELECT * FROM history ORDER BY id DESC')
-    rows = c.fetchall()
-    connection.close()
-    # Parse safe_sequence from JSON
+        list: List of history records (id, n, m, result, suggestions, safe_sequence, timestamp)
+        with safe_sequence decoded to a list.
+    """
+    # Pooled connections are not probed (no SELECT 1) on checkout or return: they are
+    # local, WAL-backed handles on one file, and a broken one raises on its next use anyway.
+    connection = _readers.get()
+    try:
+        # Only the columns history.html renders; the matrices are never shown there
+        rows = connection.execute('SELECT id, n, m, result, suggestions, safe_sequence, timestamp '
+                                  'FROM history ORDER BY id DESC LIMIT ?', (limit,)).fetchall()
+    finally:
+        _readers.put(connection)
+    # Decode safe_sequence from its BLOB
     parsed_rows = []
     for row in rows:
         parsed_row = list(row)
-        if row[8]:  # safe_sequence column
+        if row[5]:  # safe_sequence column
             try:
-                parsed_row[8] = json.loads(row[8])
-            except json.JSONDecodeError:
-                parsed_row[8] = None  # In case of invalid JSON
+                parsed_row[5] = _from_blob(row[5])
+            except (json.JSONDecodeError, ValueError):
+                parsed_row[5] = None  # In case of a corrupt value
         parsed_rows.append(parsed_row)
     return parsed_rows
 
+_MISSING_FIELDS = "Invalid input. Fill in every field."
+
 @app.route('/', methods=['GET', 'POST'])
 def index():
     """
@@ -171,11 +406,24 @@ def index():
     safe_sequence = None
     if request.method == 'POST':
         try:
-            n = int(request.form['n'])
-            m = int(request.form['m'])
-            allocation = [[int(request.form[f'alloc_{i}_{j}']) for j in range(m)] for i in range(n)]
-            request_matrix = [[int(request.form[f'req_{i}_{j}']) for j in range(m)] for i in range(n)]
-            available = [int(request.form[f'avail_{j}']) for j in range(m)]
+            # Copy the MultiDict once into a plain dict for cheap repeated lookups
+            form = request.form.to_dict()
+            n = int(form['n'])
+            m = int(form['m'])
+            if n < 0 or m < 0:
+                result = "Input error: Number of processes and resources must be non-negative."
+                return render_template('index.html', result=result, suggestions=suggestions, safe_sequence=safe_sequence)
+            # fromiter preallocates count values, so make sure the fields were actually submitted
+            if 2 * n * m + m + 2 > len(form):
+                result = _MISSING_FIELDS
+                return render_template('index.html', result=result, suggestions=suggestions, safe_sequence=safe_sequence)
+            # Parse each matrix straight into an int32 array for detect_deadlock
+            vals = (form[f'alloc_{i}_{j}'] for i in range(n) for j in range(m))
+            allocation = np.fromiter(map(int, vals), dtype=np.int32, count=n * m).reshape(n, m)
+            vals = (form[f'req_{i}_{j}'] for i in range(n) for j in range(m))
+            request_matrix = np.fromiter(map(int, vals), dtype=np.int32, count=n * m).reshape(n, m)
+            vals = (form[f'avail_{j}'] for j in range(m))
+            available = np.fromiter(map(int, vals), dtype=np.int32, count=m)
 
             valid, error = validate_inputs(n, m, allocation, request_matrix, available)
             if not valid:
@@ -186,6 +434,10 @@ def index():
                 safe_sequence = safe_seq if not is_deadlock else None
                 suggestions = suggest_resolution(deadlocked, allocation, request_matrix)
                 save_to_db(n, m, allocation, request_matrix, available, result, suggestions, safe_sequence)
+        except KeyError:
+            result = _MISSING_FIELDS
+        except OverflowError:
+            result = "Invalid input. Values must fit in a 32-bit integer."
         except ValueError:
             result = "Invalid input. Enter integers only."
     return render_template('index.html', result=result, suggestions=suggestions, safe_sequence=safe_sequence)